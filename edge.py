@@ -8,7 +8,7 @@ werden. Initial ist der Wert `-1`, was bedeutet: noch nicht belegt / nicht besti
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Edge:
     """
     Repräsentiert eine gerichtete Kante.
@@ -15,6 +15,8 @@ from typing import List, Tuple
 import random
 import argparse
 
+import numpy as np
+
 from node import Node
 from edge import Edge
 
@@ -42,25 +44,41 @@ def generate_random_directed_graph(num_nodes: int, num_edges: int, seed: int, su
         raise ValueError(f"num_edges muss zwischen 0 und {max_edges} liegen (ohne Selbstschleifen)")
 
     rng = random.Random(seed)
+    nprng = np.random.default_rng(seed)
 
-    # Erzeuge supplies so, dass die Gesamtsumme 0 ist.
-    nodes: List[Node] = []
-    for i in range(num_nodes - 1):
-        s = rng.randint(-supply_range, supply_range)
-        nodes.append(Node(id=i, supply=s))
+    # Erzeuge supplies so, dass die Gesamtsumme 0 ist. Ein vektorisierter
+    # RNG-Aufruf füllt das ganze Array; nur der Bau der Node-Objekte bleibt
+    # eine Python-Schleife.
+    supplies = nprng.integers(-supply_range, supply_range + 1, size=max(num_nodes - 1, 0))
+    nodes: List[Node] = [Node(id=i, supply=s) for i, s in enumerate(supplies.tolist())]
 
     # Balanciere die Summe durch den letzten Knoten aus
-    sum_so_far = sum(n.supply for n in nodes)
+    sum_so_far = int(supplies.sum())
     if balance_demand:
         last_supply = -sum_so_far
         nodes.append(Node(id=num_nodes - 1, supply=last_supply))
     else:
         print(f"Info: Die Summe der supplies ist {sum_so_far}")
 
-    # Erzeuge alle möglichen gerichteten Kanten (ohne Selbstschleifen)
-    possible_edges = [(i, j) for i in range(num_nodes) for j in range(num_nodes) if i != j]
-    rng.shuffle(possible_edges)
-    chosen = possible_edges[:num_edges] # slicing
+    # Ziehe num_edges eindeutige Kanten (ohne Selbstschleifen). Statt alle
+    # n*(n-1) Kantentupel zu materialisieren und zu mischen, werden flache
+    # Kantenindizes ohne Zurücklegen gezogen (Floyd-Sampling in NumPy) und
+    # erst die gezogenen Indizes zu (u, v) dekodiert: O(num_edges) statt O(n^2).
+    if num_nodes > 1 and num_edges * 2 < max_edges:
+        flat = nprng.choice(max_edges, size=num_edges, replace=False)
+        u = flat // (num_nodes - 1)
+        v = flat % (num_nodes - 1)
+        v = np.where(v >= u, v + 1, v)  # Diagonale (Selbstschleifen) überspringen
+        chosen = zip(u.tolist(), v.tolist())
+    else:
+        # nahe am vollständigen Graphen: `random.sample` auf dem (lazy)
+        # range-Objekt zieht ohne Zurücklegen in O(num_edges) Zeit und
+        # Speicher — die frühere n*(n-1)-Tupelliste samt Shuffle entfällt
+        samples = rng.sample(range(max_edges), num_edges)
+        chosen = []
+        for flat in samples:
+            u, r = divmod(flat, num_nodes - 1)
+            chosen.append((u, r + 1 if r >= u else r))
     edges: List[Edge] = [Edge(source=s, target=t, transported=-1) for (s, t) in chosen]
 
     return nodes, edges
@@ -6,7 +6,7 @@ Ein positiver Wert bedeutet Produktion, ein negativer Konsum.
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     """Repräsentiert einen Knoten im gerichteten Graphen.
 